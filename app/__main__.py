@@ -0,0 +1,29 @@
+"""
+Production entry point: ``python -m app``.
+
+Starts uvicorn with the number of worker processes taken from settings,
+so the service can use several CPU cores without changing the image.
+"""
+
+import uvicorn
+
+from app.core.config import get_settings
+
+
+def main() -> None:
+    """Run the application server with settings-driven worker count."""
+
+    settings = get_settings()
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=settings.workers,
+        # "auto" picks uvloop where it is installed (not on Windows / PyPy).
+        loop="auto",
+        http="httptools",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,36 @@ API routes for managing phone-address records.
 
 All endpoints in this module are grouped under the `/phone-addresses` prefix
 and documented via FastAPI's OpenAPI/Swagger integration.
+
+Handlers return plain dictionaries and declare ``response_model=None``: the
+data comes straight from the service, so FastAPI does not validate it again
+and the default ``ORJSONResponse`` serializes it directly. Response schemas
+are still published in OpenAPI through the ``responses`` mapping.
+
+Request bodies are read as raw bytes and validated with
+``model_validate_json``, which parses and validates JSON in a single
+pydantic-core call instead of ``json.loads`` followed by FastAPI's
+field-by-field body validation. Their schemas are referenced from
+``openapi_extra`` and registered in ``components/schemas`` by
+:func:`body_schemas`.
+
+The service is not injected with ``Depends``: ``lifespan`` creates it once
+and stores it in ``app.state.phone_service``, where handlers read it.
 """
 
+import json
 from http import HTTPStatus
+from typing import Any, TypeVar
 
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, HTTPException, Path, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.openapi.constants import REF_TEMPLATE
+from pydantic import BaseModel, ValidationError
+from pydantic.json_schema import models_json_schema
 
-from app.api.v1.deps import get_phone_address_service
 from app.schemas.phone_address import (
     ErrorResponse,
+    PhoneAddressBatchRequest,
     PhoneAddressCreate,
     PhoneAddressRead,
     PhoneAddressUpdate,
@@ -20,11 +41,156 @@ from app.services.phone_address_service import PhoneAddressService
 
 router = APIRouter(prefix="/phone-addresses", tags=["Phone-address management"])
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Request body models referenced by ``_json_body``, by schema name.
+_body_models: dict[str, type[BaseModel]] = {}
+
+
+def _json_body(model: type[BaseModel]) -> dict[str, Any]:
+    """Build ``openapi_extra`` describing a required JSON body of ``model``.
+
+    FastAPI does not see the body parameter, so the fragment also documents
+    the 422 response it would otherwise add automatically. The body schema is
+    a ``$ref``; ``model`` is remembered so that :func:`body_schemas` can
+    register it under ``components/schemas``.
+
+    Args:
+        model: Pydantic model that describes the request body.
+
+    Returns:
+        dict[str, Any]: OpenAPI ``requestBody`` and ``responses`` fragment.
+    """
+
+    _body_models[model.__name__] = model
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"$ref": REF_TEMPLATE.format(model=model.__name__)}},
+            },
+        },
+        "responses": {
+            str(HTTPStatus.UNPROCESSABLE_ENTITY.value): {
+                "description": "Validation Error",
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/HTTPValidationError"},
+                    },
+                },
+            },
+        },
+    }
+
+
+def body_schemas() -> dict[str, Any]:
+    """Return OpenAPI component schemas of the request bodies of this router.
+
+    Generated clients get named request models only if the schemas behind
+    the ``$ref`` entries of :func:`_json_body` are in ``components/schemas``.
+
+    Returns:
+        dict[str, Any]: Schemas of the body models and of the models nested
+        in them, keyed by schema name.
+    """
+
+    _, top_level = models_json_schema(
+        [(model, "validation") for model in _body_models.values()],
+        ref_template=REF_TEMPLATE,
+    )
+    schemas: dict[str, Any] = top_level.get("$defs", {})
+    return schemas
+
+
+def _is_json_content_type(content_type: str | None) -> bool:
+    """Tell whether FastAPI would parse a body with this ``Content-Type`` as JSON.
+
+    Like FastAPI, a missing header, ``application/json`` and any
+    ``application/*+json`` type count as JSON.
+
+    Args:
+        content_type: Raw value of the ``Content-Type`` header.
+
+    Returns:
+        bool: ``True`` if the body must be parsed as JSON.
+    """
+
+    if not content_type:
+        return True
+    media_type = content_type.partition(";")[0].strip().lower()
+    maintype, _, subtype = media_type.partition("/")
+    return maintype == "application" and (subtype == "json" or subtype.endswith("+json"))
+
+
+async def _parse_body(request: Request, model: type[ModelT]) -> ModelT:
+    """Validate the raw JSON request body against ``model``.
+
+    Valid JSON bodies take the ``model_validate_json`` fast path. Rejected
+    bodies are checked again the way FastAPI checks a body parameter, so
+    clients get the same 422 errors as from a regular FastAPI body.
+
+    Args:
+        request: Incoming HTTP request.
+        model: Pydantic model to validate the body with.
+
+    Raises:
+        RequestValidationError: If the body is missing, is not JSON, or does
+            not match the model; FastAPI turns it into the usual 422 response.
+        HTTPException: With status 400 if the body cannot be decoded as text.
+
+    Returns:
+        ModelT: Validated model instance.
+    """
+
+    body = await request.body()
+    if not body:
+        raise RequestValidationError(
+            [{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}]
+        )
+
+    payload: Any = body  # FastAPI validates a non-JSON body as raw bytes.
+    if _is_json_content_type(request.headers.get("content-type")):
+        try:
+            return model.model_validate_json(body)
+        except ValidationError:
+            pass
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError as exc:
+            raise RequestValidationError(
+                [
+                    {
+                        "type": "json_invalid",
+                        "loc": ("body", exc.pos),
+                        "msg": "JSON decode error",
+                        "input": {},
+                        "ctx": {"error": exc.msg},
+                    }
+                ]
+            ) from exc
+        except Exception as exc:
+            # E.g. UnicodeDecodeError for a body that is not UTF-8/16/32.
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail="There was an error parsing the body",
+            ) from exc
+
+    try:
+        return model.model_validate(payload, from_attributes=True)
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)]
+        ) from exc
+
 
 @router.get(
     "/{phone}",
-    response_model=PhoneAddressRead,
+    response_model=None,
     responses={
+        HTTPStatus.OK.value: {
+            "model": PhoneAddressRead,
+            "description": "Phone number and its address.",
+        },
         HTTPStatus.NOT_FOUND.value: {
             "model": ErrorResponse,
             "description": "Phone number was not found in the storage.",
@@ -37,41 +203,85 @@ router = APIRouter(prefix="/phone-addresses", tags=["Phone-address management"])
     ),
 )
 async def get_phone_address(
+    request: Request,
     phone: str = Path(..., description="Phone number to look up."),
-    service: PhoneAddressService = Depends(get_phone_address_service),
-) -> PhoneAddressRead:
+) -> dict[str, str]:
     """Retrieve an address for the specified phone number.
 
     Args:
+        request: Incoming request; gives access to the shared service.
         phone: Phone number whose address should be retrieved.
-        service: Business-logic service used to access storage.
 
     Raises:
         HTTPException: With status 404 if phone is not found.
 
     Returns:
-        PhoneAddressRead: Model containing phone number and its address.
+        dict[str, str]: Phone number and its address.
     """
 
+    service: PhoneAddressService = request.app.state.phone_service
     result = await service.get(phone)
     if result is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail="Phone number not found.",
         )
-    return result
+    return {"phone": result.phone, "address": result.address}
+
+
+@router.post(
+    "/batch-get",
+    response_model=None,
+    responses={
+        HTTPStatus.OK.value: {
+            "model": list[PhoneAddressRead | None],
+            "description": "Records in request order; null for missing phone numbers.",
+        },
+    },
+    openapi_extra=_json_body(PhoneAddressBatchRequest),
+    summary="Get addresses for several phone numbers",
+    description=(
+        "Return addresses for all given phone numbers in one call. "
+        "The result keeps the order of the request; missing numbers are returned as null."
+    ),
+)
+async def batch_get_phone_addresses(
+    request: Request,
+) -> list[dict[str, str] | None]:
+    """Retrieve addresses for several phone numbers at once.
+
+    Args:
+        request: Request whose JSON body is a :class:`PhoneAddressBatchRequest`.
+
+    Returns:
+        list[dict[str, str] | None]: Records in request order, ``None`` for
+        phone numbers that are not present in the storage.
+    """
+
+    payload = await _parse_body(request, PhoneAddressBatchRequest)
+    service: PhoneAddressService = request.app.state.phone_service
+    records = await service.get_many(payload.phones)
+    return [
+        None if record is None else {"phone": record.phone, "address": record.address}
+        for record in records
+    ]
 
 
 @router.post(
     "",
-    response_model=PhoneAddressRead,
+    response_model=None,
     status_code=HTTPStatus.CREATED,
     responses={
+        HTTPStatus.CREATED.value: {
+            "model": PhoneAddressRead,
+            "description": "The newly created record.",
+        },
         HTTPStatus.CONFLICT.value: {
             "model": ErrorResponse,
             "description": "Phone number already exists and cannot be created again.",
         },
     },
+    openapi_extra=_json_body(PhoneAddressCreate),
     summary="Create new phone-address record",
     description=(
         "Create a new binding between phone number and address. "
@@ -79,40 +289,46 @@ async def get_phone_address(
     ),
 )
 async def create_phone_address(
-    payload: PhoneAddressCreate,
-    service: PhoneAddressService = Depends(get_phone_address_service),
-) -> PhoneAddressRead:
+    request: Request,
+) -> dict[str, str]:
     """Create a new phone-address record.
 
     Args:
-        payload: Validated request body with ``phone`` and ``address`` fields.
-        service: Business-logic service used to access storage.
+        request: Request whose JSON body is a :class:`PhoneAddressCreate`
+            with ``phone`` and ``address`` fields.
 
     Raises:
         HTTPException: With status 409 if the phone number already exists.
 
     Returns:
-        PhoneAddressRead: Model containing the newly created record.
+        dict[str, str]: The newly created record.
     """
 
+    payload = await _parse_body(request, PhoneAddressCreate)
+    service: PhoneAddressService = request.app.state.phone_service
     created = await service.create(payload)
     if not created:
         raise HTTPException(
             status_code=HTTPStatus.CONFLICT,
             detail="Phone number already exists.",
         )
-    return PhoneAddressRead(phone=payload.phone, address=payload.address)
+    return {"phone": payload.phone, "address": payload.address}
 
 
 @router.put(
     "/{phone}",
-    response_model=PhoneAddressRead,
+    response_model=None,
     responses={
+        HTTPStatus.OK.value: {
+            "model": PhoneAddressRead,
+            "description": "The updated record.",
+        },
         HTTPStatus.NOT_FOUND.value: {
             "model": ErrorResponse,
             "description": "Phone number not found; nothing to update.",
         },
     },
+    openapi_extra=_json_body(PhoneAddressUpdate),
     summary="Update existing phone-address record",
     description=(
         "Update the address associated with the specified phone number. "
@@ -120,31 +336,32 @@ async def create_phone_address(
     ),
 )
 async def update_phone_address(
-    payload: PhoneAddressUpdate,
+    request: Request,
     phone: str = Path(..., description="Phone number whose address should be updated."),
-    service: PhoneAddressService = Depends(get_phone_address_service),
-) -> PhoneAddressRead:
+) -> dict[str, str]:
     """Update an address for the given phone number.
 
     Args:
-        payload: Request body containing the new address value.
+        request: Request whose JSON body is a :class:`PhoneAddressUpdate`
+            containing the new address value.
         phone: Phone number whose address must be updated.
-        service: Business-logic service used to access storage.
 
     Raises:
         HTTPException: With status 404 if the phone number does not exist.
 
     Returns:
-        PhoneAddressRead: Model containing the updated record.
+        dict[str, str]: The updated record.
     """
 
+    payload = await _parse_body(request, PhoneAddressUpdate)
+    service: PhoneAddressService = request.app.state.phone_service
     updated = await service.update(phone=phone, address=payload.address)
     if not updated:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail="Phone number not found.",
         )
-    return PhoneAddressRead(phone=phone, address=payload.address)
+    return {"phone": phone, "address": payload.address}
 
 
 @router.delete(
@@ -166,14 +383,14 @@ async def update_phone_address(
     ),
 )
 async def delete_phone_address(
+    request: Request,
     phone: str = Path(..., description="Phone number whose record should be deleted."),
-    service: PhoneAddressService = Depends(get_phone_address_service),
 ) -> None:
     """Delete phone-address record by phone number.
 
     Args:
+        request: Incoming request; gives access to the shared service.
         phone: Phone number whose record should be removed.
-        service: Business-logic service used to access storage.
 
     Raises:
         HTTPException: With status 404 if the phone number does not exist.
@@ -182,6 +399,7 @@ async def delete_phone_address(
         None: The endpoint returns empty body with HTTP 204 status on success.
     """
 
+    service: PhoneAddressService = request.app.state.phone_service
     deleted = await service.delete(phone=phone)
     if not deleted:
         raise HTTPException(
@@ -7,6 +7,7 @@ configuration from environment variables (including the .env file).
 
 from functools import lru_cache
 
+from pydantic import PositiveInt
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -17,11 +18,35 @@ class Settings(BaseSettings):
         project_name: Human-readable name of the service.
         api_v1_prefix: URL prefix for all v1 API endpoints.
         redis_url: Connection URL for the Redis instance.
+        redis_max_connections: Upper bound of the Redis connection pool size;
+            must be positive.
+        redis_pool_timeout: Seconds to wait for a free pooled connection
+            before giving up.
+        workers: Number of uvicorn worker processes started by
+            ``python -m app``; must be positive.
+        cache_size: Maximum number of addresses kept in the per-process
+            read cache; ``0`` disables the cache.
+        cache_ttl: Lifetime of a cached address in seconds.
+        cache_tracking: Whether to evict cached addresses on Redis
+            client-side tracking invalidations (Redis 6+).
+        write_batch_size: Maximum number of queued writes sent to Redis in
+            one pipeline; must be positive.
+        bucket_count: Number of Redis hashes records are spread over; about
+            the number of records divided by 100. Must not change while
+            data is stored.
     """
 
     project_name: str = "Phone Address Service"
     api_v1_prefix: str = "/api/v1"
     redis_url: str = "redis://redis:6379/0"
+    redis_max_connections: PositiveInt = 100
+    redis_pool_timeout: float = 5.0
+    workers: PositiveInt = 1
+    cache_size: int = 10_000
+    cache_ttl: float = 60.0
+    cache_tracking: bool = True
+    write_batch_size: PositiveInt = 200
+    bucket_count: PositiveInt = 16_384
 
     model_config = SettingsConfigDict(
         env_file=".env",
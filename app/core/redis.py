@@ -2,26 +2,42 @@
 Redis client initialization and lifecycle management.
 
 This module provides a single shared Redis client instance that is
-created on application startup and closed on shutdown.
+created on application startup and closed on shutdown, and a listener for
+Redis client-side caching invalidations that keeps the per-process address
+cache in sync with writes made by other processes.
 """
 
-from collections.abc import AsyncIterator
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Callable
 from contextlib import asynccontextmanager
-from typing import Any
+from typing import Any, Final
 
 import redis.asyncio as redis
 from fastapi import FastAPI
+from redis.asyncio.connection import AbstractConnection
+from redis.exceptions import ResponseError
 
-from app.core.config import get_redis_url
+from app.core.config import get_redis_url, get_settings
+from app.services.phone_address_service import LocalAddressCache, PhoneAddressService
 
 RedisClient = redis.Redis
 
+INVALIDATION_CHANNEL: Final[bytes] = b"__redis__:invalidate"
+RECONNECT_DELAY_SECONDS: Final[float] = 1.0
+# The tracking connection is otherwise idle; PING keeps it under the server's
+# idle `timeout` and detects a silently closed connection.
+TRACKER_PING_INTERVAL_SECONDS: Final[float] = 15.0
+
+logger = logging.getLogger(__name__)
+
 
 class RedisConnector:
     """High-level wrapper responsible for managing Redis client lifecycle.
 
     The connector lazily initializes a :class:`redis.asyncio.Redis` client
-    using configuration provided by :mod:`app.core.config`.
+    backed by a :class:`redis.asyncio.BlockingConnectionPool`, using
+    configuration provided by :mod:`app.core.config`.
     """
 
     def __init__(self) -> None:
@@ -32,15 +48,28 @@ class RedisConnector:
     def client(self) -> RedisClient:
         """Return an initialized Redis client.
 
-        The client is created on first access. If initialization fails, an
-        exception from the underlying :mod:`redis` library is raised.
+        The client is created on first access. redis-py decodes RESP replies
+        with the C-based ``hiredis`` parser, installed as the
+        ``redis[hiredis]`` extra, instead of the pure-Python one. When all
+        pooled connections are busy, a command waits for a free one up to
+        ``redis_pool_timeout`` seconds instead of failing immediately. If
+        initialization fails, an exception from the underlying :mod:`redis`
+        library is raised.
 
         Returns:
             RedisClient: Shared Redis client instance.
         """
 
         if self._client is None:
-            self._client = redis.from_url(get_redis_url())
+            settings = get_settings()
+            pool = redis.BlockingConnectionPool.from_url(
+                get_redis_url(),
+                max_connections=settings.redis_max_connections,
+                timeout=settings.redis_pool_timeout,
+                decode_responses=True,
+            )
+            # from_pool hands pool ownership to the client, so aclose() drains it.
+            self._client = redis.Redis.from_pool(pool)
         return self._client
 
     async def close(self) -> None:
@@ -54,13 +83,133 @@ class RedisConnector:
 redis_connector = RedisConnector()
 
 
+class InvalidationListener:
+    """Background task that receives Redis invalidation messages for a key prefix.
+
+    The listener uses Redis 6+ client-side tracking in broadcasting mode over
+    RESP2. One pooled connection subscribes to ``__redis__:invalidate``. A
+    second one runs ``CLIENT TRACKING ON REDIRECT <id> BCAST PREFIX <prefix>``,
+    so every change of a matching key, made by any client, is published to
+    the first connection.
+
+    Redis stops sending invalidations when either connection drops. The
+    tracking connection carries no other traffic, so it is pinged every
+    ``TRACKER_PING_INTERVAL_SECONDS``; a failed ping is handled like a failure
+    of the subscribed connection. Every (re)connect and every failure calls
+    ``on_invalidate(None)`` to flush everything cached while nothing was
+    being tracked.
+    """
+
+    def __init__(
+        self,
+        connector: RedisConnector,
+        prefix: bytes,
+        on_invalidate: Callable[[list[bytes] | None], None],
+    ) -> None:
+        """Initialize the listener without starting it.
+
+        Args:
+            connector: Connector whose client pool provides the connections.
+            prefix: Key prefix to track.
+            on_invalidate: Callback receiving changed keys, or ``None`` when
+                the whole cache must be dropped.
+        """
+
+        self._connector = connector
+        self._prefix = prefix
+        self._on_invalidate = on_invalidate
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start listening in a background task."""
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background task and wait until it releases connections."""
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Keep the subscription alive, re-creating it after failures."""
+
+        while True:
+            try:
+                await self._listen()
+            except ResponseError:
+                # Redis older than 6.0 has no CLIENT TRACKING: rely on the TTL.
+                logger.warning("Redis client-side tracking is not supported", exc_info=True)
+                self._on_invalidate(None)
+                return
+            except (OSError, redis.RedisError):
+                logger.warning("Redis invalidation listener disconnected", exc_info=True)
+                self._on_invalidate(None)
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    async def _listen(self) -> None:
+        """Subscribe, enable tracking and dispatch invalidations until failure."""
+
+        pool = self._connector.client.connection_pool
+        connections: list[AbstractConnection] = []
+        try:
+            listener: AbstractConnection = await pool.get_connection("SUBSCRIBE")
+            connections.append(listener)
+            await listener.send_command("CLIENT", "ID")
+            listener_id = await listener.read_response()
+            await listener.send_command("SUBSCRIBE", INVALIDATION_CHANNEL)
+            await listener.read_response()
+
+            tracker: AbstractConnection = await pool.get_connection("CLIENT")
+            connections.append(tracker)
+            await tracker.send_command(
+                "CLIENT", "TRACKING", "ON", "REDIRECT", listener_id, "BCAST", "PREFIX", self._prefix
+            )
+            await tracker.read_response()
+
+            # Anything cached before tracking was active may already be stale.
+            self._on_invalidate(None)
+
+            loop = asyncio.get_running_loop()
+            next_ping = loop.time() + TRACKER_PING_INTERVAL_SECONDS
+            while True:
+                # Returns None when nothing arrives before the next ping is due.
+                message = await listener.read_response(
+                    disable_decoding=True, timeout=max(next_ping - loop.time(), 0.0)
+                )
+                if isinstance(message, list) and message[:2] == [b"message", INVALIDATION_CHANNEL]:
+                    # A null payload means FLUSHDB/FLUSHALL: every key is invalid.
+                    self._on_invalidate(message[2])
+                if loop.time() >= next_ping:
+                    await tracker.send_command("PING")
+                    await tracker.read_response()
+                    next_ping = loop.time() + TRACKER_PING_INTERVAL_SECONDS
+        finally:
+            # Both connections carry subscription/tracking state, so they are
+            # closed before going back to the pool.
+            for connection in connections:
+                await connection.disconnect()
+                await pool.release(connection)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[dict[str, Any]]:
     """Application lifespan manager for FastAPI.
 
     This function is used as a lifespan context manager in the FastAPI
-    application. It ensures that Redis resources are properly cleaned up
-    on application shutdown.
+    application. On startup it publishes the shared Redis client and
+    :class:`PhoneAddressService` as ``app.state.redis`` and
+    ``app.state.phone_service``, so request handlers read them directly
+    instead of resolving dependencies on every request, and starts the
+    :class:`InvalidationListener` that keeps the local address cache in sync
+    with Redis. On shutdown it stops the listener and ensures that Redis
+    resources are properly cleaned up.
 
     Args:
         app: The FastAPI application instance.
@@ -70,8 +219,29 @@ async def lifespan(app: FastAPI) -> AsyncIterator[dict[str, Any]]:
         be used in future for shared resources.
     """
 
+    settings = get_settings()
+    app.state.redis = redis_connector.client
+    service = PhoneAddressService(
+        app.state.redis,
+        cache=LocalAddressCache(maxsize=settings.cache_size, ttl=settings.cache_ttl),
+        write_batch_size=settings.write_batch_size,
+        bucket_count=settings.bucket_count,
+    )
+    app.state.phone_service = service
+
+    listener: InvalidationListener | None = None
+    if settings.cache_size > 0 and settings.cache_tracking:
+        listener = InvalidationListener(
+            redis_connector,
+            prefix=PhoneAddressService.KEY_PREFIX,
+            on_invalidate=service.cache.invalidate,
+        )
+        listener.start()
+
     state: dict[str, Any] = {}
     try:
         yield state
     finally:
+        if listener is not None:
+            await listener.stop()
         await redis_connector.close()
@@ -5,16 +5,33 @@ The module defines the FastAPI application, configures metadata for
 automatic documentation (Swagger / OpenAPI) and registers all API routers.
 """
 
-from fastapi import Depends, FastAPI
+import asyncio
+import time
+from http import HTTPStatus
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from redis.asyncio import Redis
 
-from app.api.v1.deps import get_redis_client
+from app.api.v1.routes_phone_address import body_schemas
 from app.api.v1.routes_phone_address import router as phone_address_router
 from app.core.config import get_settings
 from app.core.redis import lifespan
 
 settings = get_settings()
 
+# Redis status is re-checked at most once per interval; probes in between
+# get the cached result. A ping that takes longer than the timeout counts
+# as "unavailable" so a hung Redis cannot stall the health endpoint.
+HEALTH_CACHE_SECONDS = 1.0
+HEALTH_PING_TIMEOUT = 0.5
+
+# (monotonic time of the last ping, redis status it produced)
+_last_ping: tuple[float, str] = (float("-inf"), "unavailable")
+# Ping in flight; concurrent probes wait for it instead of sending their own.
+_ping_task: asyncio.Task[str] | None = None
+
 description = """
 Service for storing and managing "phone - address" pairs.
 
@@ -35,32 +52,79 @@ app = FastAPI(
         "url": "https://example.com",
     },
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     swagger_ui_parameters={"defaultModelsExpandDepth": 1},
 )
 
 app.include_router(phone_address_router, prefix=settings.api_v1_prefix)
 
 
+def openapi() -> dict[str, Any]:
+    """Build the OpenAPI schema once, including the request body models.
+
+    Handlers parse their bodies themselves, so FastAPI does not register the
+    body models in ``components/schemas``; they are added here.
+
+    Returns:
+        dict[str, Any]: Cached OpenAPI schema of the application.
+    """
+
+    if app.openapi_schema is not None:
+        return app.openapi_schema
+    openapi_schema = FastAPI.openapi(app)
+    openapi_schema.setdefault("components", {}).setdefault("schemas", {}).update(body_schemas())
+    return openapi_schema
+
+
+app.openapi = openapi  # type: ignore[method-assign]
+
+
+async def _ping_redis(redis: Redis) -> str:
+    """Ping Redis once, remember the result and return the redis status."""
+
+    global _last_ping, _ping_task
+
+    try:
+        pong = await asyncio.wait_for(redis.ping(), HEALTH_PING_TIMEOUT)
+        redis_status = "ok" if pong else "unavailable"
+    except Exception:
+        redis_status = "unavailable"
+    finally:
+        _ping_task = None
+    _last_ping = (time.monotonic(), redis_status)
+    return redis_status
+
+
 @app.get(
     "/health",
+    response_model=None,
+    responses={HTTPStatus.OK.value: {"model": dict[str, str]}},
     tags=["Service"],
     summary="Health check",
     description="Simple endpoint for checking that the service is alive.",
 )
-async def healthcheck(redis: Redis = Depends(get_redis_client)) -> dict[str, str]:
+async def healthcheck(request: Request) -> dict[str, str]:
     """Return service health status.
 
     This endpoint can be used by monitoring systems or orchestrators to
-    verify that the application is running.
+    verify that the application is running. Redis is pinged at most once
+    per ``HEALTH_CACHE_SECONDS``, so frequent probes do not add load: probes
+    arriving while a ping is in flight wait for that ping.
+
+    Args:
+        request: Incoming request; gives access to the shared Redis client.
 
     Returns:
         dict[str, str]: A dictionary with a single ``status`` field.
     """
-    try:
-        pong = await redis.ping()
-        redis_status = "ok" if pong else "unavailable"
-    except Exception:
-        redis_status = "unavailable"
+    global _ping_task
+
+    checked_at, redis_status = _last_ping
+    if time.monotonic() - checked_at >= HEALTH_CACHE_SECONDS:
+        if _ping_task is None:
+            _ping_task = asyncio.create_task(_ping_redis(request.app.state.redis))
+        # Shielded: a disconnecting client must not cancel the shared ping.
+        redis_status = await asyncio.shield(_ping_task)
 
     overall = "ok" if redis_status == "ok" else "degraded"
 
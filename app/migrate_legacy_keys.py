@@ -0,0 +1,45 @@
+"""
+One-off storage migration: ``python -m app.migrate_legacy_keys``.
+
+Earlier versions of the service stored every record as a
+``phone_address:<phone>`` string key; the service now reads records from
+hash buckets only. Run this module once after the old version is stopped
+and before the new one takes traffic. It is safe to run again, e.g. if an
+old instance kept writing during a rolling deploy.
+"""
+
+import asyncio
+import logging
+
+from app.core.config import get_settings
+from app.core.redis import redis_connector
+from app.services.phone_address_service import PhoneAddressService
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate() -> int:
+    """Move all legacy records into hash buckets.
+
+    Returns:
+        int: Number of records written to buckets.
+    """
+
+    settings = get_settings()
+    service = PhoneAddressService(redis_connector.client, bucket_count=settings.bucket_count)
+    try:
+        return await service.migrate_legacy_keys()
+    finally:
+        await redis_connector.close()
+
+
+def main() -> None:
+    """Run the migration and log how many records were moved."""
+
+    logging.basicConfig(level=logging.INFO)
+    moved_count = asyncio.run(migrate())
+    logger.info("Moved %d records from legacy keys into hash buckets", moved_count)
+
+
+if __name__ == "__main__":
+    main()
@@ -53,6 +53,18 @@ class PhoneAddressRead(PhoneAddressBase):
     )
 
 
+class PhoneAddressBatchRequest(BaseModel):
+    """Model for looking up several phone numbers in one request."""
+
+    phones: list[str] = Field(
+        ...,
+        description="Phone numbers to look up. The response keeps the same order.",
+        examples=[["+7 999 123-45-67", "+7 921 000-00-00"]],
+        min_length=1,
+        max_length=1000,
+    )
+
+
 class ErrorResponse(BaseModel):
     """Generic error response model.
 
@@ -1,4 +1,17 @@
-import re
+class _DigitsOnlyTable(dict[int, int | None]):
+    """
+    Translation table for str.translate that keeps only decimal digits.
+    ASCII is precomputed; other code points are checked on lookup and not stored,
+    so the table stays small. Digits are the same set as ``\\d`` in ``re``.
+    """
+
+    def __missing__(self, codepoint: int) -> int | None:
+        return codepoint if chr(codepoint).isdecimal() else None
+
+
+_DIGITS_ONLY = _DigitsOnlyTable(
+    {codepoint: codepoint if chr(codepoint).isdecimal() else None for codepoint in range(128)}
+)
 
 
 def normalize_phone(phone: str) -> str:
@@ -6,6 +19,11 @@ def normalize_phone(phone: str) -> str:
     Accepts a phone number in any format and returns a string containing only digits.
     Removes spaces, parentheses, dashes, plus signs, and decimalization.
     """
-    digits = re.sub(r"\D+", "", phone)
+    # Already normalized input is returned as is. isdecimal (not isdigit) keeps
+    # the same digit set as the translation table, e.g. "²" is still dropped.
+    if phone.isdecimal():
+        return phone
+
+    digits = phone.translate(_DIGITS_ONLY)
 
     return digits
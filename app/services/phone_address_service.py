@@ -6,43 +6,347 @@ implements all rules related to creation, update, retrieval and deletion
 of phone-address pairs.
 """
 
-from typing import Final
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from typing import Any, Final, NamedTuple
+from zlib import crc32
 
+from cachetools import TTLCache
 from redis.asyncio import Redis
+from redis.exceptions import NoScriptError
 
 from app.schemas.phone_address import PhoneAddressCreate, PhoneAddressRead
 from app.services.normalize_phone import normalize_phone
 
 
+class LocalAddressCache:
+    """Per-process read-through cache of addresses.
+
+    Records live in Redis hashes grouped into buckets (see
+    :class:`PhoneAddressService`), and invalidations arrive per bucket. A
+    generation counter is bumped on every invalidation, and each bucket
+    remembers the generation of its last invalidation. Each cached address
+    remembers the generation taken before it was read, so invalidating a
+    bucket turns every address of the bucket into a miss in O(1). Stale
+    entries then age out through the TTL / LRU policy of the underlying
+    :class:`cachetools.TTLCache`.
+
+    Writes made through the service invalidate their bucket immediately.
+    Writes made by other processes are reported by Redis client-side
+    tracking (see :class:`app.core.redis.InvalidationListener`). A read that
+    started before an invalidation of its bucket, or of the whole cache,
+    does not store its (possibly stale) result, which avoids a race between
+    ``get`` and a concurrent write. Reads of other buckets are not affected.
+    """
+
+    # Upper bound of tracked bucket generations before a full reset.
+    _MAX_TRACKED_BUCKETS: Final[int] = 100_000
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of cached addresses; ``0`` disables caching.
+            ttl: Lifetime of a cached address in seconds.
+        """
+
+        self._data: TTLCache[bytes, tuple[str, int]] | None = (
+            TTLCache(maxsize=maxsize, ttl=ttl) if maxsize > 0 else None
+        )
+        # Generation of the last invalidation of each bucket / of everything.
+        self._bucket_generations: dict[bytes, int] = {}
+        self._flushed_generation = 0
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Return the current invalidation generation."""
+
+        return self._generation
+
+    def get(self, bucket: bytes, field: bytes) -> str | None:
+        """Return a cached address or ``None`` on a miss."""
+
+        if self._data is None:
+            return None
+        entry = self._data.get(field)
+        if entry is None or entry[1] < self._bucket_generations.get(bucket, 0):
+            return None
+        return entry[0]
+
+    def put(self, bucket: bytes, field: bytes, address: str, generation: int) -> None:
+        """Store an address read from Redis.
+
+        Args:
+            bucket: Redis hash the address was read from.
+            field: Hash field (normalized phone number) of the address.
+            address: Address value returned by Redis.
+            generation: Value of :attr:`generation` taken before the read;
+                the entry is dropped if ``bucket`` or the whole cache was
+                invalidated since then.
+        """
+
+        if self._data is None:
+            return
+        if generation >= max(self._bucket_generations.get(bucket, 0), self._flushed_generation):
+            self._data[field] = (address, generation)
+
+    def invalidate(self, buckets: Iterable[bytes] | None = None) -> None:
+        """Evict the given buckets, or the whole cache when ``buckets`` is ``None``."""
+
+        self._generation += 1
+        if self._data is None:
+            return
+        if buckets is None or len(self._bucket_generations) > self._MAX_TRACKED_BUCKETS:
+            self._data.clear()
+            self._bucket_generations.clear()
+            self._flushed_generation = self._generation
+            return
+        for bucket in buckets:
+            self._bucket_generations[bucket] = self._generation
+
+
+# HSET that only overwrites an existing field (hashes have no "HSET XX").
+_HSET_IF_EXISTS_SCRIPT: Final[str] = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 1 then
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Moves a legacy string record into its hash bucket without overwriting a
+# record that is already there; the string key is removed either way.
+_MOVE_LEGACY_KEY_SCRIPT: Final[str] = """
+if redis.call('TYPE', KEYS[1]).ok ~= 'string' then
+    return 0
+end
+local value = redis.call('GET', KEYS[1])
+redis.call('DEL', KEYS[1])
+return redis.call('HSETNX', KEYS[2], ARGV[1], value)
+"""
+
+
+class _PendingWrite(NamedTuple):
+    """A hash write waiting in the write queue, with its caller's future."""
+
+    future: asyncio.Future[Any]
+    bucket: bytes
+    field: bytes
+    value: str
+    only_if_exists: bool
+
+
 class PhoneAddressService:
-    """Service responsible for managing phone-address records in Redis."""
+    """Service responsible for managing phone-address records in Redis.
+
+    Records are stored in Redis hashes. The field is the normalized phone
+    number, and the bucket is its CRC32 modulo ``bucket_count``. Grouping
+    many small records into one hash saves the per-key overhead of the Redis
+    keyspace, and every single-record operation is still one command. The
+    saving only holds while a hash keeps the compact listpack encoding
+    (``hash-max-listpack-entries``, 128 by default), so ``bucket_count``
+    should be about the number of records divided by 100. Leading digits
+    would not work as a bucket: they are the country and operator code, and
+    one operator can have millions of numbers.
+
+    Writes (``create`` / ``update``) are coalesced: concurrent calls are
+    queued and sent to Redis together in one non-transactional pipeline, up
+    to ``write_batch_size`` commands per round-trip. Reads are sent directly.
+
+    Hash commands are issued through ``execute_command``: redis-py's typed
+    hash helpers only accept ``str`` keys, while keys here are pre-encoded
+    ``bytes``.
+
+    All bucket keys start with :attr:`KEY_PREFIX`. The prefix is kept
+    distinctive: ``SCAN`` in :meth:`list_phones` / :meth:`delete_all` and
+    client-side tracking match every key with it. It also differs from the
+    legacy ``phone_address:<phone>`` string keys of earlier versions, which
+    :meth:`migrate_legacy_keys` moves into buckets.
+    """
 
-    def __init__(self, redis_client: Redis) -> None:
+    KEY_PREFIX: Final[bytes] = b"phone_address:bucket:"
+    LEGACY_KEY_PREFIX: Final[bytes] = b"phone_address:"
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        cache: LocalAddressCache | None = None,
+        write_batch_size: int = 200,
+        bucket_count: int = 16_384,
+    ) -> None:
         """Initialize the service with a Redis client instance.
 
         Args:
             redis_client: An asynchronous Redis client used as the underlying
                 storage backend.
+            cache: Local address cache used by :meth:`get`. Its ``invalidate``
+                method is also the callback for Redis invalidation messages.
+                ``None`` disables local caching.
+            write_batch_size: Maximum number of queued writes sent to Redis
+                in one pipeline.
+            bucket_count: Number of hash buckets records are spread over.
+                Changing it moves records to other buckets, so it must stay
+                the same for existing data.
+
+        Raises:
+            ValueError: If ``write_batch_size`` or ``bucket_count`` is not
+                positive.
         """
 
+        if write_batch_size <= 0:
+            raise ValueError(f"write_batch_size must be positive, got {write_batch_size}.")
+        if bucket_count <= 0:
+            raise ValueError(f"bucket_count must be positive, got {bucket_count}.")
         self._redis: Final[Redis] = redis_client
+        self.cache: Final[LocalAddressCache] = (
+            cache if cache is not None else LocalAddressCache(maxsize=0, ttl=0)
+        )
+        self._write_batch_size: Final = write_batch_size
+        self._bucket_count: Final = bucket_count
+        # Bound once: hot paths skip the attribute lookups on every call.
+        self._execute_command: Final = redis_client.execute_command
+        self._pipeline: Final = redis_client.pipeline
+        # Sent by SHA1 with EVALSHA; loaded on demand after a NOSCRIPT reply.
+        self._hset_if_exists: Final = redis_client.register_script(_HSET_IF_EXISTS_SCRIPT)
+        self._pending_writes: list[_PendingWrite] = []
+        self._flush_task: asyncio.Task[None] | None = None
 
-    @staticmethod
-    def _make_key(phone: str) -> str:
-        """Build a Redis key for a given phone number.
+    def _make_key(self, phone: str) -> tuple[bytes, bytes]:
+        """Build the Redis hash key and field for a given phone number.
+
+        Both parts are built as ``bytes`` so redis-py sends them without
+        encoding them again.
 
         Args:
             phone: Phone number that should be used as a storage key.
 
         Returns:
-            str: A namespaced Redis key.
+            tuple[bytes, bytes]: Namespaced bucket key and the hash field.
+        """
+        field = normalize_phone(phone).encode()
+        bucket = self.KEY_PREFIX + b"%d" % (crc32(field) % self._bucket_count)
+        return bucket, field
+
+    async def _write(
+        self, bucket: bytes, field: bytes, value: str, *, only_if_exists: bool
+    ) -> bool:
+        """Queue a hash write and wait for the pipeline that sends it.
+
+        A flush task is started on demand and exits once the queue is empty,
+        so there is no background task to manage between bursts of writes.
+
+        Args:
+            bucket: Redis hash to write to.
+            field: Hash field to write.
+            value: Value to store.
+            only_if_exists: Overwrite an existing field (``update``) instead of
+                creating a missing one (``create``).
+
+        Raises:
+            redis.RedisError: If Redis rejected this command or the batch
+                could not be sent.
+            RuntimeError: If the write queue was stopped before the write was
+                confirmed.
+
+        Returns:
+            bool: ``True`` if Redis applied the write.
+        """
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._pending_writes.append(_PendingWrite(future, bucket, field, value, only_if_exists))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_writes())
+            self._flush_task.add_done_callback(self._on_flush_done)
+        return bool(await future)
+
+    async def _flush_writes(self) -> None:
+        """Send queued writes in pipelines until the queue is empty.
+
+        Every caller gets the reply to its own command. A command error, such
+        as ``WRONGTYPE``, fails only that write. A connection error fails the
+        whole batch. If the task is interrupted (e.g. cancelled on shutdown),
+        every write still waiting for a reply is failed, so no caller hangs.
         """
-        normalized_phone = normalize_phone(phone)
-        return f"phone_address:{normalized_phone}"
+
+        batch: list[_PendingWrite] = []
+        try:
+            while self._pending_writes:
+                # Let writers scheduled in the same loop iteration join the batch.
+                await asyncio.sleep(0)
+                batch = self._pending_writes[: self._write_batch_size]
+                del self._pending_writes[: self._write_batch_size]
+                results: list[Any]
+                try:
+                    results = await self._send_writes(batch)
+                    missing_script = [
+                        index
+                        for index, result in enumerate(results)
+                        if isinstance(result, NoScriptError)
+                    ]
+                    if missing_script:
+                        # The script cache is empty (restart, failover, SCRIPT
+                        # FLUSH): load the script and resend only those writes.
+                        await self._execute_command("SCRIPT", "LOAD", self._hset_if_exists.script)
+                        resent = await self._send_writes([batch[i] for i in missing_script])
+                        for index, result in zip(missing_script, resent, strict=True):
+                            results[index] = result
+                except Exception as exc:
+                    results = [exc] * len(batch)
+                for write, result in zip(batch, results, strict=True):
+                    if write.future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        write.future.set_exception(result)
+                    else:
+                        write.future.set_result(result)
+        finally:
+            self._flush_task = None
+            # Only an interrupted flush leaves unresolved writes behind.
+            self._fail_writes([*batch, *self._pending_writes])
+            self._pending_writes.clear()
+
+    async def _send_writes(self, writes: list[_PendingWrite]) -> list[Any]:
+        """Send ``writes`` in one pipeline; command errors are returned as replies."""
+
+        async with self._pipeline(transaction=False) as pipe:
+            for write in writes:
+                args = (write.bucket, write.field, write.value)
+                if write.only_if_exists:
+                    pipe.execute_command("EVALSHA", self._hset_if_exists.sha, 1, *args)
+                else:
+                    pipe.execute_command("HSETNX", *args)
+            results: list[Any] = await pipe.execute(raise_on_error=False)
+        return results
+
+    def _on_flush_done(self, task: asyncio.Task[None]) -> None:
+        """Fail queued writes of a flush task that was cancelled before it started.
+
+        Such a task never enters :meth:`_flush_writes`, so its ``finally``
+        block does not run and the task is still registered as current.
+        """
+
+        if self._flush_task is task:
+            self._flush_task = None
+            self._fail_writes(self._pending_writes)
+            self._pending_writes.clear()
+
+    @staticmethod
+    def _fail_writes(writes: Iterable[_PendingWrite]) -> None:
+        """Fail every write in ``writes`` that has no result yet."""
+
+        for write in writes:
+            if not write.future.done():
+                write.future.set_exception(
+                    RuntimeError("Write queue stopped before the write was confirmed.")
+                )
 
     async def get(self, phone: str) -> PhoneAddressRead | None:
         """Retrieve phone-address record by phone number.
 
+        Recently read addresses are served from :attr:`cache` without a
+        Redis round-trip.
+
         Args:
             phone: Phone number to search for.
 
@@ -51,17 +355,51 @@ class PhoneAddressService:
             or ``None`` when no data is found.
         """
 
-        key = self._make_key(phone)
-        address = await self._redis.get(key)
+        bucket, field = self._make_key(phone)
+        address = self.cache.get(bucket, field)
         if address is None:
-            return None
-        return PhoneAddressRead(phone=phone, address=address)
+            generation = self.cache.generation
+            address = await self._execute_command("HGET", bucket, field)
+            if address is None:
+                return None
+            self.cache.put(bucket, field, address, generation)
+        # Data comes from our own storage: skip pydantic validation.
+        return PhoneAddressRead.model_construct(phone=phone, address=address)
+
+    async def get_many(self, phones: list[str]) -> list[PhoneAddressRead | None]:
+        """Retrieve phone-address records for several phone numbers at once.
+
+        All ``HGET`` commands are sent in a single pipeline, so the lookup
+        costs one round-trip regardless of the number of phones.
+
+        Args:
+            phones: Phone numbers to search for.
+
+        Returns:
+            list[PhoneAddressRead | None]: Records in the same order as
+            ``phones``; ``None`` marks a phone number without data.
+        """
+
+        if not phones:
+            return []
+
+        async with self._pipeline(transaction=False) as pipe:
+            for phone in phones:
+                pipe.execute_command("HGET", *self._make_key(phone))
+            addresses = await pipe.execute()
+        return [
+            None
+            if address is None
+            else PhoneAddressRead.model_construct(phone=phone, address=address)
+            for phone, address in zip(phones, addresses, strict=True)
+        ]
 
     async def create(self, data: PhoneAddressCreate) -> bool:
         """Create a new phone-address record.
 
-        The method uses the Redis ``SETNX`` command semantics: the record is
-        created only if the key does not already exist.
+        The method uses the Redis ``HSETNX`` command semantics: the record is
+        created only if the field does not already exist. The command goes
+        through the write queue and may share a pipeline with other writes.
 
         Args:
             data: Validated payload with ``phone`` and ``address`` fields.
@@ -71,14 +409,18 @@ class PhoneAddressService:
             with the same phone number already exists.
         """
 
-        key = self._make_key(data.phone)
-        # set(name, value, nx=True) -> only set if key does not exist
-        was_set: bool | None = await self._redis.set(key, data.address, nx=True)
-        return bool(was_set)
+        bucket, field = self._make_key(data.phone)
+        was_set = await self._write(bucket, field, data.address, only_if_exists=False)
+        self.cache.invalidate((bucket,))
+        return was_set
 
     async def update(self, phone: str, address: str) -> bool:
         """Update address for an existing phone number.
 
+        Hashes have no ``HSET XX``, so a small Lua script checks the field
+        and overwrites it atomically. It is still a single round-trip, shared
+        with other queued writes.
+
         Args:
             phone: Phone number whose address must be updated.
             address: New address value.
@@ -88,13 +430,10 @@ class PhoneAddressService:
             no such phone number was found.
         """
 
-        key = self._make_key(phone)
-
-        exists = await self._redis.exists(key)
-        if not exists:
-            return False
-        await self._redis.set(key, address)
-        return True
+        bucket, field = self._make_key(phone)
+        was_set = await self._write(bucket, field, address, only_if_exists=True)
+        self.cache.invalidate((bucket,))
+        return was_set
 
     async def delete(self, phone: str) -> bool:
         """Delete phone-address record from storage.
@@ -107,6 +446,136 @@ class PhoneAddressService:
             there was nothing to delete.
         """
 
-        key = self._make_key(phone)
-        deleted_count = await self._redis.delete(key)
+        bucket, field = self._make_key(phone)
+        deleted_count = await self._execute_command("HDEL", bucket, field)
+        self.cache.invalidate((bucket,))
         return bool(deleted_count > 0)
+
+    async def delete_many(self, phones: list[str]) -> int:
+        """Delete records for several phone numbers at once.
+
+        Fields are grouped by bucket and removed with one multi-field ``HDEL``
+        per bucket, all sent in a single pipeline (one round-trip).
+
+        Args:
+            phones: Phone numbers whose records should be removed.
+
+        Returns:
+            int: Number of records that existed and were deleted.
+        """
+
+        if not phones:
+            return 0
+
+        fields_by_bucket: dict[bytes, list[bytes]] = {}
+        for phone in phones:
+            bucket, field = self._make_key(phone)
+            fields_by_bucket.setdefault(bucket, []).append(field)
+
+        async with self._pipeline(transaction=False) as pipe:
+            for bucket, fields in fields_by_bucket.items():
+                pipe.execute_command("HDEL", bucket, *fields)
+            deleted_counts = await pipe.execute()
+        self.cache.invalidate(fields_by_bucket)
+        return sum(deleted_counts)
+
+    async def list_phones(self, batch_size: int = 500) -> AsyncIterator[str]:
+        """Iterate over all stored (normalized) phone numbers.
+
+        Buckets are walked with ``SCAN`` and their fields with ``HSCAN``, so
+        Redis is never blocked by a full listing and memory use stays bounded.
+
+        Args:
+            batch_size: ``COUNT`` hint passed to ``SCAN`` / ``HSCAN``.
+
+        Yields:
+            str: Normalized phone number of each stored record.
+        """
+
+        async for bucket in self._redis.scan_iter(match=self.KEY_PREFIX + b"*", count=batch_size):
+            async for field, _ in self._redis.hscan_iter(bucket, count=batch_size):
+                yield field
+
+    async def delete_all(self, batch_size: int = 500) -> int:
+        """Delete every phone-address record.
+
+        Buckets are collected with ``SCAN`` and removed ``batch_size`` at a
+        time: one ``MULTI`` pipeline counts their fields with ``HLEN`` and
+        drops them with a multi-key ``DEL``, i.e. O(buckets / batch_size)
+        round-trips.
+
+        Args:
+            batch_size: Number of buckets scanned and deleted per round-trip.
+
+        Returns:
+            int: Number of deleted records.
+        """
+
+        deleted_count = 0
+        batch: list[str] = []
+        async for bucket in self._redis.scan_iter(match=self.KEY_PREFIX + b"*", count=batch_size):
+            batch.append(bucket)
+            if len(batch) >= batch_size:
+                deleted_count += await self._delete_buckets(batch)
+                batch.clear()
+        if batch:
+            deleted_count += await self._delete_buckets(batch)
+        self.cache.invalidate()
+        return deleted_count
+
+    async def migrate_legacy_keys(self, batch_size: int = 500) -> int:
+        """Move records stored under legacy ``phone_address:<phone>`` keys into buckets.
+
+        Earlier versions stored every record as a string key. Such keys are
+        found with ``SCAN`` and moved ``batch_size`` at a time, one pipeline
+        per round-trip. Each key is moved by a Lua script, so reading the
+        value, writing it to the bucket and deleting the key is atomic. A
+        record that already exists in its bucket is newer than the legacy
+        one and is kept. The migration can be re-run safely.
+
+        Args:
+            batch_size: ``COUNT`` hint passed to ``SCAN`` and number of keys
+                moved per round-trip.
+
+        Returns:
+            int: Number of records written to buckets.
+        """
+
+        bucket_prefix = self.KEY_PREFIX.decode()
+        sha: str = await self._execute_command("SCRIPT", "LOAD", _MOVE_LEGACY_KEY_SCRIPT)
+        moved_count = 0
+        batch: list[str] = []
+        async for key in self._redis.scan_iter(
+            match=self.LEGACY_KEY_PREFIX + b"*", count=batch_size
+        ):
+            if key.startswith(bucket_prefix):
+                continue
+            batch.append(key)
+            if len(batch) >= batch_size:
+                moved_count += await self._move_legacy_keys(sha, batch)
+                batch.clear()
+        if batch:
+            moved_count += await self._move_legacy_keys(sha, batch)
+        self.cache.invalidate()
+        return moved_count
+
+    async def _move_legacy_keys(self, sha: str, keys: list[str]) -> int:
+        """Move the given legacy keys and return how many records were written."""
+
+        prefix_length = len(self.LEGACY_KEY_PREFIX)
+        async with self._pipeline(transaction=False) as pipe:
+            for key in keys:
+                bucket, field = self._make_key(key[prefix_length:])
+                pipe.execute_command("EVALSHA", sha, 2, key, bucket, field)
+            written = await pipe.execute()
+        return sum(written)
+
+    async def _delete_buckets(self, buckets: list[str]) -> int:
+        """Delete the given buckets and return how many records they held."""
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for bucket in buckets:
+                pipe.hlen(bucket)
+            pipe.delete(*buckets)
+            *sizes, _ = await pipe.execute()
+        return sum(sizes)
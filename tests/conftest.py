@@ -1,62 +1,236 @@
-from collections.abc import AsyncGenerator, Generator
-from typing import Any
+import hashlib
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable, Generator
+from fnmatch import fnmatchcase
+from functools import partial
+from importlib.util import find_spec
+from typing import Any, Generic, NamedTuple, TypeVar
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from redis.exceptions import NoScriptError, ResponseError
 
-from app.api.v1.deps import get_redis_client
 from app.main import app
+from app.services.phone_address_service import PhoneAddressService
 
+T = TypeVar("T")
 
-class FakeRedis:
-    """The simplest in-memory Redis alternative for testing."""
 
-    def __init__(self) -> None:
-        self._store: dict[str, str] = {}
-
-    async def get(self, name: str) -> str | None:
-        return self._store.get(name)
-
-    async def set(self, name: str, value: str, nx: bool | None = None) -> bool:
-        if nx:
-            if name in self._store:
-                return False
-            self._store[name] = value
-            return True
-        self._store[name] = value
-        return True
+def _sha1(script: str) -> str:
+    return hashlib.sha1(script.encode()).hexdigest()
+
+
+class FakeScript(NamedTuple):
+    """Результат register_script: исходный текст и его SHA1."""
+
+    script: str
+    sha: str
+
+
+def _as_bytes(name: bytes | str) -> bytes:
+    return name.encode() if isinstance(name, str) else name
+
+
+class _ResolvedAwaitable(Generic[T]):
+    """Уже готовый результат, который можно await-ить без создания корутины."""
+
+    __slots__ = ("_value",)
+
+    def __init__(self, value: T) -> None:
+        self._value = value
+
+    def __await__(self) -> Generator[Any, None, T]:
+        yield from ()
+        return self._value
+
+
+class FakePipeline:
+    """Buffers commands and runs them one by one on ``execute()``."""
+
+    def __init__(self, redis: "FakeRedis") -> None:
+        self._redis = redis
+        self._commands: list[Callable[[], Awaitable[Any]]] = []
 
-    async def exists(self, name: str) -> int:
-        return int(name in self._store)
+    async def __aenter__(self) -> "FakePipeline":
+        return self
 
-    async def delete(self, name: str) -> int:
-        return int(self._store.pop(name, None) is not None)
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._commands.clear()
+
+    def execute_command(self, *args: Any) -> "FakePipeline":
+        self._commands.append(partial(self._redis.execute_command, *args))
+        return self
+
+    def hlen(self, name: bytes | str) -> "FakePipeline":
+        self._commands.append(partial(self._redis.hlen, name))
+        return self
+
+    def delete(self, *names: bytes | str) -> "FakePipeline":
+        self._commands.append(partial(self._redis.delete, *names))
+        return self
+
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        """Run buffered commands; like redis-py, command errors become replies."""
+        commands, self._commands = self._commands, []
+        self._redis.executed_pipelines += 1
+        results: list[Any] = []
+        for command in commands:
+            try:
+                results.append(await command())
+            except ResponseError as exc:
+                results.append(exc)
+        errors = [result for result in results if isinstance(result, ResponseError)]
+        if raise_on_error and errors:
+            raise errors[0]
+        return results
+
+
+class FakeRedis:
+    """In-memory Redis для тестов API и unit-тестов сервиса.
+
+    Хранит hash-бакеты и строковые ключи старого формата (``strings``), поддерживает
+    hget/hsetnx/evalsha/script load/hdel/hlen/delete/scan_iter/hscan_iter/pipeline/ping
+    и register_script.
+
+    Команды — обычные методы, которые сразу возвращают ``_ResolvedAwaitable``:
+    вызывающий код делает ``await`` как с настоящим клиентом, но без лишних корутин.
+    Методы словаря ``_store`` привязаны заранее, поэтому ``_store`` нельзя
+    переприсваивать — только очищать.
+    """
+
+    __slots__ = (
+        "_store",
+        "_get",
+        "_pop",
+        "_setdefault",
+        "strings",
+        "scripts",
+        "executed_pipelines",
+    )
+
+    def __init__(self) -> None:
+        self._store: dict[bytes, dict[bytes, str]] = {}
+        self._get = self._store.get
+        self._pop = self._store.pop
+        self._setdefault = self._store.setdefault
+        self.strings: dict[bytes, str] = {}
+        # SHA1 загруженных скриптов, как кэш скриптов Redis.
+        self.scripts: set[str] = set()
+        self.executed_pipelines = 0
+
+    def execute_command(self, command: str, *args: Any) -> Awaitable[Any]:
+        method: Callable[..., Awaitable[Any]] = getattr(self, command.lower())
+        return method(*args)
+
+    def hget(self, name: bytes, key: bytes) -> Awaitable[str | None]:
+        return _ResolvedAwaitable(self._get(name, {}).get(key))
+
+    def hsetnx(self, name: bytes, key: bytes, value: str) -> Awaitable[bool]:
+        fields = self._setdefault(name, {})
+        if key in fields:
+            return _ResolvedAwaitable(False)
+        fields[key] = value
+        return _ResolvedAwaitable(True)
+
+    def register_script(self, script: str) -> FakeScript:
+        return FakeScript(script, _sha1(script))
+
+    def script(self, subcommand: str, source: str) -> Awaitable[str]:
+        """Поддерживает только SCRIPT LOAD."""
+        assert subcommand == "LOAD"
+        sha = _sha1(source)
+        self.scripts.add(sha)
+        return _ResolvedAwaitable(sha)
+
+    def evalsha(self, sha: str, numkeys: int, *args: Any) -> Awaitable[int]:
+        """Эмулирует скрипты сервиса, различая их по числу ключей.
+
+        1 ключ — update (HSET существующего поля), 2 ключа — перенос строкового
+        ключа старого формата в бакет.
+        """
+        if sha not in self.scripts:
+            raise NoScriptError("No matching script. Please use EVAL.")
+        if numkeys == 2:
+            return self._move_legacy_key(*args)
+        return self._hset_if_exists(*args)
+
+    def _hset_if_exists(self, name: bytes, key: bytes, value: str) -> Awaitable[int]:
+        fields = self._get(name, {})
+        if key not in fields:
+            return _ResolvedAwaitable(0)
+        fields[key] = value
+        return _ResolvedAwaitable(1)
+
+    def _move_legacy_key(self, legacy_key: str, name: bytes, key: bytes) -> Awaitable[int]:
+        value = self.strings.pop(_as_bytes(legacy_key), None)
+        if value is None:
+            return _ResolvedAwaitable(0)
+        return self.hsetnx(name, key, value)
+
+    def hdel(self, name: bytes, *keys: bytes) -> Awaitable[int]:
+        fields = self._get(name, {})
+        deleted = sum(fields.pop(key, None) is not None for key in keys)
+        if not fields:
+            self._pop(name, None)
+        return _ResolvedAwaitable(deleted)
+
+    def hlen(self, name: bytes | str) -> Awaitable[int]:
+        return _ResolvedAwaitable(len(self._get(_as_bytes(name), {})))
+
+    def delete(self, *names: bytes | str) -> Awaitable[int]:
+        pop = self._pop
+        deleted = sum(pop(_as_bytes(name), None) is not None for name in names)
+        return _ResolvedAwaitable(deleted)
+
+    async def scan_iter(self, match: bytes, count: int | None = None) -> AsyncIterator[str]:
+        # Snapshot keys: callers may delete while iterating, as with real SCAN.
+        for name in [*self._store, *self.strings]:
+            if fnmatchcase(name, match):
+                yield name.decode()
+
+    async def hscan_iter(
+        self, name: bytes | str, count: int | None = None
+    ) -> AsyncIterator[tuple[str, str]]:
+        for key, value in list(self._get(_as_bytes(name), {}).items()):
+            yield key.decode(), value
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
 
     async def ping(self) -> bool:
         """Эмуляция redis.ping() — в тестах всегда 'живой'."""
         return True
 
 
+@pytest.fixture(scope="session")
+def anyio_backend() -> str | tuple[str, dict[str, Any]]:
+    """Run async tests on asyncio only, in one event loop for the whole session.
+
+    The loop is uvloop, as in production, where it is installed (it is not
+    available on Windows).
+    """
+    if find_spec("uvloop") is None:
+        return "asyncio"
+    return "asyncio", {"use_uvloop": True}
+
+
 @pytest.fixture
 def fake_redis() -> FakeRedis:
     return FakeRedis()
 
 
-@pytest.fixture(autouse=True)
-def override_redis_dependency(fake_redis: FakeRedis) -> Generator[None, None, None]:
-    """Replace the get_redis_client dependency with fake_redis for all tests."""
-
-    def _get_fake_redis() -> FakeRedis:
-        return fake_redis
-
-    app.dependency_overrides[get_redis_client] = _get_fake_redis
+@pytest.fixture
+def app_state(fake_redis: FakeRedis) -> Generator[None, None, None]:
+    """Put fake_redis and a service on top of it into app.state, as lifespan does."""
+    app.state.redis = fake_redis
+    app.state.phone_service = PhoneAddressService(fake_redis)  # type: ignore[arg-type]
     yield
-    app.dependency_overrides.pop(get_redis_client, None)
+    del app.state.phone_service
+    del app.state.redis
 
 
 @pytest.fixture
-async def async_client() -> AsyncGenerator[AsyncClient, Any]:
-    """HTTP client for testing FastAPI applications."""
+async def async_client(app_state: None) -> AsyncGenerator[AsyncClient, Any]:
+    """HTTP client for testing FastAPI applications, backed by fake_redis."""
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
         yield client
@@ -33,6 +33,132 @@ async def test_create_phone_address_conflict(
     assert resp2.json()["detail"] == "Phone number already exists."
 
 
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "content,content_type,status_code,detail",
+    [
+        (
+            b'{"phone": "1", "address": "Addr"}',
+            "application/json",
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+            [
+                {
+                    "type": "string_too_short",
+                    "loc": ["body", "phone"],
+                    "msg": "String should have at least 3 characters",
+                    "input": "1",
+                    "ctx": {"min_length": 3},
+                },
+            ],
+        ),
+        (
+            b'{"phone": "12345"}',
+            "application/json",
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+            [
+                {
+                    "type": "missing",
+                    "loc": ["body", "address"],
+                    "msg": "Field required",
+                    "input": {"phone": "12345"},
+                },
+            ],
+        ),
+        (
+            b"{not json",
+            "application/json",
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+            [
+                {
+                    "type": "json_invalid",
+                    "loc": ["body", 1],
+                    "msg": "JSON decode error",
+                    "input": {},
+                    "ctx": {"error": "Expecting property name enclosed in double quotes"},
+                },
+            ],
+        ),
+        (
+            b"",
+            "application/json",
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+            [{"type": "missing", "loc": ["body"], "msg": "Field required", "input": None}],
+        ),
+        (
+            b"[1, 2]",
+            "application/json",
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+            [
+                {
+                    "type": "model_attributes_type",
+                    "loc": ["body"],
+                    "msg": "Input should be a valid dictionary or object to extract fields from",
+                    "input": [1, 2],
+                },
+            ],
+        ),
+        (
+            b'{"phone": "12345", "address": "Addr"}',
+            "text/plain",
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+            [
+                {
+                    "type": "model_attributes_type",
+                    "loc": ["body"],
+                    "msg": "Input should be a valid dictionary or object to extract fields from",
+                    "input": '{"phone": "12345", "address": "Addr"}',
+                },
+            ],
+        ),
+        (
+            b'\xff\xfe{"phone":"123","address":"a"}',
+            "application/json",
+            HTTPStatus.BAD_REQUEST,
+            "There was an error parsing the body",
+        ),
+    ],
+    ids=[
+        "too-short",
+        "missing-field",
+        "invalid-json",
+        "empty",
+        "not-object",
+        "text-plain",
+        "not-utf8",
+    ],
+)
+async def test_create_phone_address_invalid_body(
+    async_client: AsyncClient,
+    content: bytes,
+    content_type: str,
+    status_code: HTTPStatus,
+    detail: object,
+) -> None:
+    """Invalid bodies get exactly the errors FastAPI reports for a body parameter."""
+    response = await async_client.post(
+        "/api/v1/phone-addresses", content=content, headers={"Content-Type": content_type}
+    )
+    assert response.status_code == status_code
+    assert response.json() == {"detail": detail}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "content_type", [None, "application/json; charset=utf-8", "application/merge-patch+json"]
+)
+async def test_create_phone_address_accepts_json_content_types(
+    async_client: AsyncClient, content_type: str | None
+) -> None:
+    """As in FastAPI, a body without Content-Type or with any JSON media type is parsed."""
+    headers = {"Content-Type": content_type} if content_type else {}
+    response = await async_client.post(
+        "/api/v1/phone-addresses",
+        content=b'{"phone": "12345", "address": "Addr"}',
+        headers=headers,
+    )
+    assert response.status_code == HTTPStatus.CREATED
+
+
 @pytest.mark.anyio
 async def test_get_phone_address_found(async_client: AsyncClient) -> None:
     """The GET endpoint must return the record if it exists.."""
@@ -99,6 +225,31 @@ async def test_delete_phone_address_success(async_client: AsyncClient) -> None:
     assert response_again.json()["detail"] == "Phone number not found."
 
 
+@pytest.mark.anyio
+async def test_batch_get_phone_addresses(async_client: AsyncClient) -> None:
+    """Batch lookup returns records in request order and null for missing phones."""
+    await async_client.post("/api/v1/phone-addresses", json={"phone": "555", "address": "A"})
+    await async_client.post("/api/v1/phone-addresses", json={"phone": "666", "address": "B"})
+
+    response = await async_client.post(
+        "/api/v1/phone-addresses/batch-get",
+        json={"phones": ["666", "unknown", "555"]},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == [
+        {"phone": "666", "address": "B"},
+        None,
+        {"phone": "555", "address": "A"},
+    ]
+
+
+@pytest.mark.anyio
+async def test_batch_get_phone_addresses_empty_list(async_client: AsyncClient) -> None:
+    """An empty list of phones is rejected by validation."""
+    response = await async_client.post("/api/v1/phone-addresses/batch-get", json={"phones": []})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
 @pytest.mark.anyio
 @pytest.mark.parametrize(
     "phone",
@@ -123,3 +274,35 @@ async def test_roundtrip_parametrized(async_client: AsyncClient, phone: str) ->
 
     resp_delete = await async_client.delete(f"/api/v1/phone-addresses/{phone}")
     assert resp_delete.status_code == HTTPStatus.NO_CONTENT
+
+
+@pytest.mark.anyio
+async def test_openapi_documents_response_models(async_client: AsyncClient) -> None:
+    """Handlers return plain dicts, but OpenAPI must still describe the record schema."""
+    response = await async_client.get("/openapi.json")
+    paths = response.json()["paths"]
+
+    record_ref = {"$ref": "#/components/schemas/PhoneAddressRead"}
+    item = paths["/api/v1/phone-addresses/{phone}"]
+    assert item["get"]["responses"]["200"]["content"]["application/json"]["schema"] == record_ref
+    assert item["put"]["responses"]["200"]["content"]["application/json"]["schema"] == record_ref
+    created = paths["/api/v1/phone-addresses"]["post"]["responses"]["201"]
+    assert created["content"]["application/json"]["schema"] == record_ref
+
+
+@pytest.mark.anyio
+async def test_openapi_documents_request_body_models(async_client: AsyncClient) -> None:
+    """Bodies are parsed by hand, but OpenAPI must reference named request models."""
+    response = await async_client.get("/openapi.json")
+    openapi = response.json()
+    paths = openapi["paths"]
+
+    bodies = {
+        "PhoneAddressCreate": paths["/api/v1/phone-addresses"]["post"],
+        "PhoneAddressUpdate": paths["/api/v1/phone-addresses/{phone}"]["put"],
+        "PhoneAddressBatchRequest": paths["/api/v1/phone-addresses/batch-get"]["post"],
+    }
+    for name, operation in bodies.items():
+        schema = operation["requestBody"]["content"]["application/json"]["schema"]
+        assert schema == {"$ref": f"#/components/schemas/{name}"}
+        assert openapi["components"]["schemas"][name]["title"] == name
@@ -1,4 +1,5 @@
 import pytest
+from pydantic import ValidationError
 
 from app.core.config import Settings
 
@@ -9,6 +10,14 @@ def test_settings_defaults() -> None:
     assert settings.project_name == "Phone Address Service"
     assert settings.api_v1_prefix == "/api/v1"
     assert settings.redis_url == "redis://redis:6379/0"
+    assert settings.redis_max_connections == 100
+    assert settings.redis_pool_timeout == 5.0
+    assert settings.workers == 1
+    assert settings.cache_size == 10_000
+    assert settings.cache_ttl == 60.0
+    assert settings.cache_tracking is True
+    assert settings.write_batch_size == 200
+    assert settings.bucket_count == 16_384
 
 
 def test_settings_env_override(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -16,9 +25,35 @@ def test_settings_env_override(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("PROJECT_NAME", "Custom Service")
     monkeypatch.setenv("API_V1_PREFIX", "/custom")
     monkeypatch.setenv("REDIS_URL", "redis://localhost:6380/1")
+    monkeypatch.setenv("REDIS_MAX_CONNECTIONS", "20")
+    monkeypatch.setenv("REDIS_POOL_TIMEOUT", "0.5")
+    monkeypatch.setenv("WORKERS", "4")
+    monkeypatch.setenv("CACHE_SIZE", "0")
+    monkeypatch.setenv("CACHE_TTL", "1.5")
+    monkeypatch.setenv("CACHE_TRACKING", "false")
 
     settings = Settings()
 
     assert settings.project_name == "Custom Service"
     assert settings.api_v1_prefix == "/custom"
     assert settings.redis_url == "redis://localhost:6380/1"
+    assert settings.redis_max_connections == 20
+    assert settings.redis_pool_timeout == 0.5
+    assert settings.workers == 4
+    assert settings.cache_size == 0
+    assert settings.cache_ttl == 1.5
+    assert settings.cache_tracking is False
+
+
+@pytest.mark.parametrize(
+    "name", ["REDIS_MAX_CONNECTIONS", "WORKERS", "WRITE_BATCH_SIZE", "BUCKET_COUNT"]
+)
+@pytest.mark.parametrize("value", ["0", "-1"])
+def test_settings_reject_non_positive_sizes(
+    monkeypatch: pytest.MonkeyPatch, name: str, value: str
+) -> None:
+    """Sizes and counts that must be positive reject zero and negative values."""
+    monkeypatch.setenv(name, value)
+
+    with pytest.raises(ValidationError, match=name.lower()):
+        Settings()
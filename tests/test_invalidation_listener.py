@@ -0,0 +1,207 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from redis.exceptions import ConnectionError, ResponseError
+
+from app.core import redis as redis_module
+from app.core.redis import INVALIDATION_CHANNEL, InvalidationListener
+
+pytestmark = pytest.mark.anyio
+
+PREFIX = b"phone_address:bucket:"
+
+
+class FakeConnection:
+    """Соединение из пула: отвечает на команды listener'а через очередь ответов.
+
+    ``errors`` задаёт исключение, которое вернётся вместо ответа на команду
+    (ключ — имя команды, для CLIENT — вместе с подкомандой).
+    """
+
+    def __init__(self, client_id: int, errors: dict[str, BaseException]) -> None:
+        self.client_id = client_id
+        self.errors = errors
+        self.sent: list[tuple[Any, ...]] = []
+        self.replies: asyncio.Queue[Any] = asyncio.Queue()
+        self.disconnected = False
+
+    async def send_command(self, *args: Any) -> None:
+        self.sent.append(args)
+        command = f"CLIENT {args[1]}" if args[0] == "CLIENT" else args[0]
+        replies = {
+            "CLIENT ID": self.client_id,
+            "SUBSCRIBE": [b"subscribe", INVALIDATION_CHANNEL, 1],
+            "CLIENT TRACKING": "OK",
+            "PING": "PONG",
+        }
+        self.replies.put_nowait(self.errors.get(command, replies[command]))
+
+    async def read_response(
+        self, disable_decoding: bool = False, timeout: float | None = None
+    ) -> Any:
+        try:
+            reply = await asyncio.wait_for(self.replies.get(), timeout)
+        except TimeoutError:
+            # Как в redis-py: по истечении явного timeout возвращается None.
+            return None
+        if isinstance(reply, BaseException):
+            raise reply
+        return reply
+
+    async def disconnect(self) -> None:
+        self.disconnected = True
+
+
+class FakePool:
+    """Пул, который выдаёт новое FakeConnection на каждый запрос.
+
+    ``errors`` — ошибки команд по порядковому номеру соединения: 0 и 1 —
+    подписка и tracking первого подключения, 2 и 3 — после переподключения.
+    """
+
+    def __init__(self, errors: dict[int, dict[str, BaseException]] | None = None) -> None:
+        self.errors = errors or {}
+        self.connections: list[FakeConnection] = []
+        self.released: list[FakeConnection] = []
+
+    async def get_connection(self, command_name: str) -> FakeConnection:
+        index = len(self.connections)
+        connection = FakeConnection(client_id=index + 1, errors=self.errors.get(index, {}))
+        self.connections.append(connection)
+        return connection
+
+    async def release(self, connection: FakeConnection) -> None:
+        self.released.append(connection)
+
+
+async def _wait_for(condition: Callable[[], bool]) -> None:
+    for _ in range(1000):
+        if condition():
+            return
+        await asyncio.sleep(0.001)
+    raise AssertionError("condition was not met in time")
+
+
+def _make_listener(pool: FakePool) -> tuple[InvalidationListener, list[Any]]:
+    calls: list[Any] = []
+    connector = SimpleNamespace(client=SimpleNamespace(connection_pool=pool))
+    listener = InvalidationListener(
+        connector,  # type: ignore[arg-type]
+        prefix=PREFIX,
+        on_invalidate=calls.append,
+    )
+    return listener, calls
+
+
+@pytest.fixture
+def pool() -> FakePool:
+    return FakePool()
+
+
+@pytest.fixture
+async def started(pool: FakePool) -> AsyncIterator[tuple[InvalidationListener, list[Any]]]:
+    listener, calls = _make_listener(pool)
+    listener.start()
+    await _wait_for(lambda: calls == [None])
+    yield listener, calls
+    await listener.stop()
+
+
+async def test_listener_enables_tracking_and_flushes_on_connect(
+    pool: FakePool, started: tuple[InvalidationListener, list[Any]]
+) -> None:
+    """После подключения включается BCAST-tracking с redirect и весь кэш сбрасывается."""
+    _, calls = started
+    subscriber, tracker = pool.connections
+
+    assert subscriber.sent == [("CLIENT", "ID"), ("SUBSCRIBE", INVALIDATION_CHANNEL)]
+    assert tracker.sent == [("CLIENT", "TRACKING", "ON", "REDIRECT", 1, "BCAST", "PREFIX", PREFIX)]
+    assert calls == [None]
+
+
+async def test_listener_dispatches_keys_and_flushdb(
+    pool: FakePool, started: tuple[InvalidationListener, list[Any]]
+) -> None:
+    """Список ключей передаётся как есть, пустой payload (FLUSHDB) — как None."""
+    _, calls = started
+    subscriber = pool.connections[0]
+
+    keys = [b"phone_address:bucket:4321"]
+    subscriber.replies.put_nowait([b"message", INVALIDATION_CHANNEL, keys])
+    subscriber.replies.put_nowait([b"message", b"other-channel", [b"ignored"]])
+    subscriber.replies.put_nowait([b"message", INVALIDATION_CHANNEL, None])
+
+    await _wait_for(lambda: len(calls) == 3)
+    assert calls == [None, keys, None]
+
+
+async def test_listener_gives_up_when_tracking_is_not_supported() -> None:
+    """ResponseError на CLIENT TRACKING: кэш сбрасывается, listener завершается без повторов."""
+    pool = FakePool(errors={1: {"CLIENT TRACKING": ResponseError("unknown subcommand")}})
+    listener, calls = _make_listener(pool)
+    listener.start()
+
+    await _wait_for(lambda: listener._task is not None and listener._task.done())
+    assert calls == [None]
+    assert len(pool.connections) == 2
+    assert all(connection.disconnected for connection in pool.connections)
+    assert pool.released == pool.connections
+    await listener.stop()
+
+
+async def test_listener_reconnects_after_connection_error(
+    pool: FakePool,
+    started: tuple[InvalidationListener, list[Any]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """OSError на подписке: кэш сбрасывается, соединения закрываются, подписка создаётся заново."""
+    monkeypatch.setattr(redis_module, "RECONNECT_DELAY_SECONDS", 0.0)
+    _, calls = started
+    first_connections = list(pool.connections)
+
+    first_connections[0].replies.put_nowait(OSError("connection reset"))
+
+    await _wait_for(lambda: len(pool.connections) == 4 and len(calls) == 3)
+    # Сброс при ошибке и сброс после нового подключения.
+    assert calls == [None, None, None]
+    assert all(connection.disconnected for connection in first_connections)
+    assert pool.released == first_connections
+    assert pool.connections[3].sent[0][:2] == ("CLIENT", "TRACKING")
+
+
+async def test_listener_pings_tracker_and_reconnects_when_it_is_closed(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Простаивающее tracking-соединение пингуется; ошибка PING ведёт к переподключению."""
+    monkeypatch.setattr(redis_module, "RECONNECT_DELAY_SECONDS", 0.0)
+    monkeypatch.setattr(redis_module, "TRACKER_PING_INTERVAL_SECONDS", 0.01)
+    closed = ConnectionError("Connection closed by server.")
+    pool = FakePool(errors={1: {"PING": closed}})
+    listener, calls = _make_listener(pool)
+    listener.start()
+
+    await _wait_for(lambda: len(pool.connections) == 4)
+    assert pool.connections[1].sent[-1] == ("PING",)
+    assert pool.released == pool.connections[:2]
+
+    # Новое tracking-соединение продолжает получать PING.
+    await _wait_for(lambda: pool.connections[3].sent.count(("PING",)) >= 2)
+    assert calls[:3] == [None, None, None]
+    await listener.stop()
+
+
+async def test_stop_disconnects_and_releases_both_connections(
+    pool: FakePool, started: tuple[InvalidationListener, list[Any]]
+) -> None:
+    """stop() отменяет задачу, закрывает и возвращает в пул оба соединения."""
+    listener, _ = started
+
+    await listener.stop()
+
+    assert listener._task is None
+    assert len(pool.connections) == 2
+    assert all(connection.disconnected for connection in pool.connections)
+    assert pool.released == pool.connections
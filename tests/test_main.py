@@ -1,8 +1,13 @@
+import asyncio
+
 import pytest
+from fastapi.routing import APIRoute
 from httpx import AsyncClient
 
+from app import main
 from app.core.config import get_settings
 from app.main import app
+from tests.conftest import FakeRedis
 
 
 @pytest.mark.anyio
@@ -17,3 +22,59 @@ def test_app_title_matches_settings() -> None:
     """У приложения title должен совпадать с PROJECT_NAME из настроек."""
     settings = get_settings()
     assert app.title == settings.project_name
+
+
+@pytest.mark.anyio
+async def test_health_endpoint_caches_redis_status(
+    async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Зависший Redis даёт degraded по таймауту, а результат кэшируется между пробами."""
+    calls = 0
+
+    async def hanging_ping(self: FakeRedis) -> bool:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(10)
+        return True
+
+    monkeypatch.setattr(main, "_last_ping", (float("-inf"), "unavailable"))
+    monkeypatch.setattr(main, "_ping_task", None)
+    monkeypatch.setattr(main, "HEALTH_PING_TIMEOUT", 0.01)
+    # FakeRedis использует __slots__, поэтому метод подменяется на классе.
+    monkeypatch.setattr(FakeRedis, "ping", hanging_ping)
+
+    for _ in range(3):
+        response = await async_client.get("/health")
+        assert response.json() == {"status": "degraded", "redis": "unavailable"}
+
+    assert calls == 1
+
+
+def test_routes_skip_response_validation() -> None:
+    """Ни один маршрут не валидирует ответ повторно: данные уже собраны сервисом."""
+    routes = [route for route in app.routes if isinstance(route, APIRoute)]
+    assert routes
+    assert [route.path for route in routes if route.response_field is not None] == []
+
+
+@pytest.mark.anyio
+async def test_concurrent_health_probes_share_one_ping(
+    async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Одновременные пробы после истечения кэша ждут один общий PING."""
+    calls = 0
+
+    async def slow_ping(self: FakeRedis) -> bool:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return True
+
+    monkeypatch.setattr(main, "_last_ping", (float("-inf"), "unavailable"))
+    monkeypatch.setattr(main, "_ping_task", None)
+    monkeypatch.setattr(FakeRedis, "ping", slow_ping)
+
+    responses = await asyncio.gather(*(async_client.get("/health") for _ in range(5)))
+
+    assert [response.json() for response in responses] == [{"status": "ok", "redis": "ok"}] * 5
+    assert calls == 1
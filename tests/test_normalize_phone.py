@@ -16,6 +16,7 @@ from app.services.normalize_phone import normalize_phone
         ("+7-999-abc-45-67", "79994567"),
         ("", ""),
         ("   123   ", "123"),
+        ("²123", "123"),
     ],
 )
 def test_normalize_phone(raw: str, expected: str) -> None:
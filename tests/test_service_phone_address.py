@@ -1,77 +1,98 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+from zlib import crc32
+
 import pytest
+from redis.exceptions import ResponseError
 
 from app.schemas.phone_address import PhoneAddressCreate
-from app.services.phone_address_service import PhoneAddressService
+from app.services.phone_address_service import LocalAddressCache, PhoneAddressService
+from tests.conftest import FakeRedis
 
+pytestmark = pytest.mark.anyio
 
-class InMemoryRedis:
-    """In-memory Redis для unit-тестов сервиса (без FastAPI).
+# (номер, адрес, новый адрес) для test_crud_lifecycle.
+CRUD_CASES: tuple[tuple[str, str, str], ...] = (
+    ("+7 999 111-11-11", "Moscow, Tverskaya 1", "Moscow, Arbat 2"),
+    ("+7 921 222-22-22", "Saint-Petersburg, Nevsky 10", "Saint-Petersburg, Liteyny 3"),
+    ("380501234567", "Kyiv, Khreschatyk 5", "Kyiv, Sahaidachnoho 7"),
+)
 
-    Нужен отдельно от FakeRedis в conftest.py, чтобы не тянуть FastAPI сюда.
-    Поведение аналогично: поддерживает get/set(nx)/exists/delete.
-    """
 
-    def __init__(self) -> None:
-        self._store: dict[str, str] = {}
+@asynccontextmanager
+async def _fresh_store(service: PhoneAddressService, redis: FakeRedis) -> AsyncIterator[None]:
+    """Изолирует случай внутри одного теста: пустое хранилище и локальный кэш."""
+    redis._store.clear()
+    service.cache.invalidate()
+    yield
 
-    async def get(self, name: str) -> str | None:
-        return self._store.get(name)
 
-    async def set(self, name: str, value: str, nx: bool | None = None) -> bool:
-        if nx:
-            if name in self._store:
-                return False
-            self._store[name] = value
-            return True
-        self._store[name] = value
-        return True
+@pytest.fixture(scope="session")
+def in_memory_redis() -> FakeRedis:
+    return FakeRedis()
 
-    async def exists(self, name: str) -> int:
-        return int(name in self._store)
 
-    async def delete(self, name: str) -> int:
-        return int(self._store.pop(name, None) is not None)
+@pytest.fixture(scope="session")
+def service(in_memory_redis: FakeRedis) -> PhoneAddressService:
+    return PhoneAddressService(
+        redis_client=in_memory_redis,  # type: ignore[arg-type]
+        cache=LocalAddressCache(maxsize=1_000, ttl=60.0),
+    )
 
 
-@pytest.fixture
-def in_memory_redis() -> InMemoryRedis:
-    return InMemoryRedis()
+@pytest.fixture(autouse=True)
+def _reset_redis(service: PhoneAddressService, in_memory_redis: FakeRedis) -> None:
+    """Сервис и хранилище общие на сессию, поэтому перед каждым тестом очищаем данные и кэш."""
+    in_memory_redis._store.clear()
+    in_memory_redis.strings.clear()
+    in_memory_redis.scripts.clear()
+    in_memory_redis.executed_pipelines = 0
+    service.cache.invalidate()
 
 
-@pytest.fixture
-def service(in_memory_redis: InMemoryRedis) -> PhoneAddressService:
-    return PhoneAddressService(redis_client=in_memory_redis)  # type: ignore[arg-type]
+async def test_crud_lifecycle(service: PhoneAddressService, in_memory_redis: FakeRedis) -> None:
+    """Создание, чтение, обновление и удаление одной записи работают последовательно."""
+    for phone, address, new_address in CRUD_CASES:
+        async with _fresh_store(service, in_memory_redis):
+            created = await service.create(
+                PhoneAddressCreate.model_construct(phone=phone, address=address)
+            )
+            assert created is True, phone
 
+            stored = await service.get(phone)
+            assert stored is not None, phone
+            assert stored.phone == phone
+            assert stored.address == address
 
-@pytest.mark.anyio
-@pytest.mark.parametrize(
-    "phone,address",
-    [
-        ("+7 999 111-11-11", "Moscow, Tverskaya 1"),
-        ("+7 921 222-22-22", "Saint-Petersburg, Nevsky 10"),
-        ("380501234567", "Kyiv, Khreschatyk 5"),
-    ],
-)
-async def test_create_and_get(service: PhoneAddressService, phone: str, address: str) -> None:
-    """Создание новой записи и последующее чтение должны работать корректно."""
-    created = await service.create(PhoneAddressCreate(phone=phone, address=address))
-    assert created is True
+            updated = await service.update(phone=phone, address=new_address)
+            assert updated is True, phone
 
-    stored = await service.get(phone)
-    assert stored is not None
-    assert stored.phone == phone
-    assert stored.address == address
+            stored = await service.get(phone)
+            assert stored is not None, phone
+            assert stored.address == new_address
+
+            deleted = await service.delete(phone)
+            assert deleted is True, phone
+            assert await service.get(phone) is None, phone
+
+            # Повторное удаление должно вернуть False
+            assert await service.delete(phone) is False, phone
 
 
-@pytest.mark.anyio
 async def test_create_conflict_on_existing_phone(service: PhoneAddressService) -> None:
     """Повторное создание с тем же номером должно возвращать False."""
     phone = "123"
     address1 = "Addr1"
     address2 = "Addr2"
 
-    created_first = await service.create(PhoneAddressCreate(phone=phone, address=address1))
-    created_second = await service.create(PhoneAddressCreate(phone=phone, address=address2))
+    created_first = await service.create(
+        PhoneAddressCreate.model_construct(phone=phone, address=address1)
+    )
+    created_second = await service.create(
+        PhoneAddressCreate.model_construct(phone=phone, address=address2)
+    )
 
     assert created_first is True
     assert created_second is False
@@ -81,45 +102,265 @@ async def test_create_conflict_on_existing_phone(service: PhoneAddressService) -
     assert stored.address == address1  # Второе создание не должно затирать адрес.
 
 
-@pytest.mark.anyio
-async def test_update_existing_phone(service: PhoneAddressService) -> None:
-    """Обновление существующей записи должно менять адрес и возвращать True."""
-    phone = "555"
-    old_address = "Old addr"
-    new_address = "New addr"
-
-    await service.create(PhoneAddressCreate(phone=phone, address=old_address))
-    updated = await service.update(phone=phone, address=new_address)
-    assert updated is True
-
-    stored = await service.get(phone)
-    assert stored is not None
-    assert stored.address == new_address
-
-
-@pytest.mark.anyio
 async def test_update_non_existing_phone_returns_false(service: PhoneAddressService) -> None:
     """Попытка обновления несуществующего номера должна вернуть False."""
     updated = await service.update(phone="unknown", address="addr")
     assert updated is False
 
+    # Обновление не должно создавать запись.
+    assert await service.get("unknown") is None
 
-@pytest.mark.anyio
-async def test_delete_existing_phone(service: PhoneAddressService) -> None:
-    """Удаление существующего номера должно возвращать True."""
-    phone = "777"
-    await service.create(PhoneAddressCreate(phone=phone, address="addr"))
-
-    deleted = await service.delete(phone)
-    assert deleted is True
 
-    # Повторное удаление должно вернуть False
-    deleted_again = await service.delete(phone)
-    assert deleted_again is False
-
-
-@pytest.mark.anyio
 async def test_delete_non_existing_phone_returns_false(service: PhoneAddressService) -> None:
     """Удаление несуществующего номера возвращает False."""
     deleted = await service.delete("no-such-phone")
     assert deleted is False
+
+
+async def test_get_many_keeps_order_and_marks_missing(service: PhoneAddressService) -> None:
+    """Пакетное чтение возвращает записи в порядке запроса и None для отсутствующих."""
+    await service.create(
+        PhoneAddressCreate.model_construct(phone="+7 999 111-11-11", address="Addr1")
+    )
+    await service.create(PhoneAddressCreate.model_construct(phone="222", address="Addr2"))
+
+    result = await service.get_many(["222", "missing", "+7 999 111-11-11"])
+
+    assert [item.address if item else None for item in result] == ["Addr2", None, "Addr1"]
+    assert result[2] is not None
+    assert result[2].phone == "+7 999 111-11-11"
+
+
+async def test_get_served_from_local_cache_until_write(
+    service: PhoneAddressService, in_memory_redis: FakeRedis
+) -> None:
+    """Повторное чтение идёт из локального кэша, запись через сервис его сбрасывает."""
+    await service.create(PhoneAddressCreate.model_construct(phone="888", address="Cached"))
+    assert (await service.get("888")) is not None
+
+    # Меняем хранилище в обход сервиса: чтение всё ещё отдаёт закэшированный адрес.
+    bucket, field = service._make_key("888")
+    in_memory_redis._store[bucket][field] = "Changed outside"
+    stored = await service.get("888")
+    assert stored is not None
+    assert stored.address == "Cached"
+
+    await service.update(phone="888", address="Updated")
+    stored = await service.get("888")
+    assert stored is not None
+    assert stored.address == "Updated"
+
+    await service.delete("888")
+    assert await service.get("888") is None
+
+
+async def test_invalidation_drops_in_flight_reads_of_its_bucket_only() -> None:
+    """Чтение, начатое до записи, не кэшируется только для бакета этой записи."""
+    cache = LocalAddressCache(maxsize=10, ttl=60.0)
+    generation = cache.generation
+
+    cache.invalidate([b"bucket:1"])
+    cache.put(b"bucket:1", b"1", "Stale", generation)
+    cache.put(b"bucket:2", b"2", "Addr2", generation)
+    assert cache.get(b"bucket:1", b"1") is None
+    assert cache.get(b"bucket:2", b"2") == "Addr2"
+
+    # После полного сброса не кэшируется ни одно чтение, начатое до него.
+    cache.invalidate()
+    cache.put(b"bucket:2", b"2", "Stale", generation)
+    assert cache.get(b"bucket:2", b"2") is None
+
+
+async def test_concurrent_writes_share_one_pipeline(
+    service: PhoneAddressService, in_memory_redis: FakeRedis
+) -> None:
+    """Одновременные записи уходят в Redis одним pipeline и сохраняют порядок."""
+    creates = [
+        service.create(PhoneAddressCreate.model_construct(phone=f"10{i}", address=f"Addr{i}"))
+        for i in range(5)
+    ]
+    duplicate = service.create(PhoneAddressCreate.model_construct(phone="100", address="Other"))
+
+    results = await asyncio.gather(*creates, duplicate)
+
+    assert results == [True, True, True, True, True, False]
+    assert in_memory_redis.executed_pipelines == 1
+    stored = await service.get("100")
+    assert stored is not None
+    assert stored.address == "Addr0"
+
+
+async def test_failed_command_fails_only_its_own_write(
+    service: PhoneAddressService, in_memory_redis: FakeRedis, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Ошибка одной команды в общем pipeline достаётся только её вызывающему."""
+    hsetnx = FakeRedis.hsetnx
+    wrongtype_bucket, _ = service._make_key("999")
+
+    def hsetnx_wrongtype(self: FakeRedis, name: bytes, key: bytes, value: str) -> Any:
+        if name == wrongtype_bucket:
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return hsetnx(self, name, key, value)
+
+    monkeypatch.setattr(FakeRedis, "hsetnx", hsetnx_wrongtype)
+
+    results = await asyncio.gather(
+        service.create(PhoneAddressCreate.model_construct(phone="111", address="Addr1")),
+        service.create(PhoneAddressCreate.model_construct(phone="999", address="Addr9")),
+        service.create(PhoneAddressCreate.model_construct(phone="222", address="Addr2")),
+        return_exceptions=True,
+    )
+
+    assert results[0] is True
+    assert isinstance(results[1], ResponseError)
+    assert results[2] is True
+    assert in_memory_redis.executed_pipelines == 1
+    assert await service.get("222") is not None
+
+
+@pytest.mark.parametrize("steps", [1, 2], ids=["before-start", "while-batching"])
+async def test_cancelled_flush_fails_queued_writes(
+    service: PhoneAddressService, in_memory_redis: FakeRedis, steps: int
+) -> None:
+    """Отмена задачи отправки не оставляет вызывающих ждать вечно."""
+    write = asyncio.create_task(
+        service.create(PhoneAddressCreate.model_construct(phone="111", address="Addr1"))
+    )
+    # 1 шаг: запись в очереди, задача отправки ещё не стартовала; 2 шага: она собирает пачку.
+    for _ in range(steps):
+        await asyncio.sleep(0)
+    flush_task = service._flush_task
+    assert flush_task is not None
+    flush_task.cancel()
+
+    with pytest.raises(RuntimeError):
+        await asyncio.wait_for(write, timeout=1)
+    assert in_memory_redis.executed_pipelines == 0
+
+    # Следующая запись запускает новую задачу отправки.
+    assert await service.create(PhoneAddressCreate.model_construct(phone="111", address="Addr1"))
+
+
+async def test_update_loads_script_after_noscript(
+    service: PhoneAddressService, in_memory_redis: FakeRedis
+) -> None:
+    """Update шлёт EVALSHA; после NOSCRIPT скрипт загружается и запись повторяется один раз."""
+    await service.create(PhoneAddressCreate.model_construct(phone="555", address="Old addr"))
+    assert in_memory_redis.scripts == set()
+
+    assert await service.update(phone="555", address="New addr") is True
+    # Пачка с NOSCRIPT и повторная отправка после SCRIPT LOAD.
+    assert in_memory_redis.executed_pipelines == 3
+    assert len(in_memory_redis.scripts) == 1
+
+    assert await service.update(phone="555", address="Newer addr") is True
+    assert in_memory_redis.executed_pipelines == 4
+    stored = await service.get("555")
+    assert stored is not None
+    assert stored.address == "Newer addr"
+
+
+async def test_delete_many_returns_deleted_count(service: PhoneAddressService) -> None:
+    """Пакетное удаление удаляет только существующие записи и возвращает их число."""
+    await service.create(
+        PhoneAddressCreate.model_construct(phone="+7 999 111-11-11", address="Addr1")
+    )
+    await service.create(PhoneAddressCreate.model_construct(phone="222", address="Addr2"))
+    assert await service.get("222") is not None
+
+    deleted = await service.delete_many(["79991111111", "222", "missing"])
+
+    assert deleted == 2
+    assert await service.get("222") is None
+    assert await service.delete_many([]) == 0
+
+
+async def test_list_phones_and_delete_all(
+    service: PhoneAddressService, in_memory_redis: FakeRedis
+) -> None:
+    """SCAN-операции видят только ключи сервиса и удаляют их пачками."""
+    for phone in ("111", "222", "333"):
+        await service.create(
+            PhoneAddressCreate.model_construct(phone=phone, address=f"Addr {phone}")
+        )
+    in_memory_redis._store[b"other:1"] = {b"f": "foreign"}
+
+    assert sorted([phone async for phone in service.list_phones()]) == ["111", "222", "333"]
+
+    assert await service.delete_all(batch_size=2) == 3
+    assert [phone async for phone in service.list_phones()] == []
+    assert in_memory_redis._store == {b"other:1": {b"f": "foreign"}}
+
+
+async def test_migrate_legacy_keys_moves_string_records(
+    service: PhoneAddressService, in_memory_redis: FakeRedis
+) -> None:
+    """Записи старого формата phone_address:<номер> переносятся в бакеты без затирания новых."""
+    await service.create(PhoneAddressCreate.model_construct(phone="222", address="New addr"))
+    in_memory_redis.strings.update(
+        {
+            b"phone_address:111": "Old 1",
+            b"phone_address:222": "Old 2",
+            b"phone_address:79991234567": "Old 3",
+        }
+    )
+    assert await service.get("111") is None
+
+    assert await service.migrate_legacy_keys(batch_size=2) == 2
+
+    assert in_memory_redis.strings == {}
+    addresses = [await service.get(phone) for phone in ("111", "222", "+7 999 123-45-67")]
+    assert [record.address if record else None for record in addresses] == [
+        "Old 1",
+        "New addr",
+        "Old 3",
+    ]
+    # Повторный запуск ничего не меняет.
+    assert await service.migrate_legacy_keys() == 0
+
+
+async def test_records_spread_over_hash_buckets(
+    service: PhoneAddressService, in_memory_redis: FakeRedis
+) -> None:
+    """Бакет — CRC32 номера: номера одного оператора расходятся по разным hash."""
+    phones = [f"7999{i:07d}" for i in range(100)]
+    for phone in phones:
+        await service.create(PhoneAddressCreate.model_construct(phone=phone, address="Addr"))
+
+    # 100 номеров на 16384 бакета: совпадения бакетов единичны.
+    assert len(in_memory_redis._store) > 95
+    assert sum(map(len, in_memory_redis._store.values())) == 100
+    bucket = b"phone_address:bucket:%d" % (crc32(b"79990000001") % 16_384)
+    assert in_memory_redis._store[bucket][b"79990000001"] == "Addr"
+    assert service._make_key("+7 999 000-00-01") == (bucket, b"79990000001")
+
+    assert (await service.get("79990000001")) is not None
+    in_memory_redis._store[bucket][b"79990000001"] = "Changed outside"
+    # Так listener передаёт сообщение инвалидации от Redis для бакета.
+    service.cache.invalidate([bucket])
+
+    stored = await service.get("79990000001")
+    assert stored is not None
+    assert stored.address == "Changed outside"
+
+
+async def test_service_without_cache_reads_redis_every_time() -> None:
+    """Без переданного кэша каждое чтение идёт в Redis."""
+    redis = FakeRedis()
+    service = PhoneAddressService(redis_client=redis)  # type: ignore[arg-type]
+    await service.create(PhoneAddressCreate.model_construct(phone="888", address="Stored"))
+    assert (await service.get("888")) is not None
+
+    bucket, field = service._make_key("888")
+    redis._store[bucket][field] = "Changed outside"
+    stored = await service.get("888")
+    assert stored is not None
+    assert stored.address == "Changed outside"
+
+
+@pytest.mark.parametrize("name", ["write_batch_size", "bucket_count"])
+@pytest.mark.parametrize("value", [0, -1])
+async def test_non_positive_sizes_are_rejected(name: str, value: int) -> None:
+    """Пустая пачка не опустошила бы очередь записи, а без бакетов ключ не построить."""
+    with pytest.raises(ValueError, match=name):
+        PhoneAddressService(redis_client=FakeRedis(), **{name: value})  # type: ignore[arg-type]